@@ -6,6 +6,11 @@ import pytest
 @pytest.fixture(scope="session", autouse=True)
 def env_setup():
     for key, value in (
+        ("AWS_ACCESS_KEY_ID", "testing"),
+        ("AWS_DEFAULT_REGION", "us-east-1"),
+        ("AWS_SECRET_ACCESS_KEY", "testing"),
+        ("AWS_SECURITY_TOKEN", "testing"),
+        ("AWS_SESSION_TOKEN", "testing"),
         ("FUZZBUCKET_FLASK_SECRET_KEY", "shhhhhhhhhhhhhhhhhhhhhhhhhhhhhhh"),
         ("FUZZBUCKET_GITHUB_OAUTH_CLIENT_ID", "abc123"),
         ("FUZZBUCKET_GITHUB_OAUTH_CLIENT_SECRET", "xyz456"),
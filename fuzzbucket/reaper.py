@@ -1,12 +1,20 @@
 import os
 import time
+import typing
 
 from . import list_vpc_boxes, log, get_ec2_client
 
 
-def reap_boxes(event: dict, context: dict, ec2_client=None, env: dict = None) -> dict:
+def reap_boxes(
+    event: dict,
+    context: dict,
+    ec2_client=None,
+    env: dict = None,
+    now: typing.Optional[float] = None,
+) -> dict:
     ec2_client = ec2_client if ec2_client is not None else get_ec2_client()
     env = env if env is not None else dict(os.environ)
+    now = now if now is not None else time.time()
     reaped_instance_ids = []
     for box in list_vpc_boxes(ec2_client, env["CF_VPC"]):
         if box.created_at is None:
@@ -16,7 +24,6 @@ def reap_boxes(event: dict, context: dict, ec2_client=None, env: dict = None) ->
         if ttl is None:
             ttl = float(env.get("FUZZBUCKET_DEFAULT_TTL", str(3600 * 4)))
         expires_at = box.created_at + ttl
-        now = time.time()
         if expires_at > now:
             log.warning(
                 f"skipping box that is not stale instance_id={box.instance_id!r} "
@@ -10,11 +10,11 @@ Configuration is accepted via the following environment variables:
 """
 import argparse
 import configparser
-import contextlib
 import datetime
 import enum
 import fnmatch
-import getpass
+import functools
+import http.client
 import io
 import json
 import logging
@@ -23,10 +23,10 @@ import pathlib
 import re
 import sys
 import textwrap
+import threading
 import typing
 import urllib.parse
 import urllib.request
-import webbrowser
 
 from fuzzbucket_client.__version__ import version as __version__
 
@@ -45,6 +45,7 @@ def config_logging(level: int = logging.INFO, stream: typing.TextIO = sys.stderr
     )
 
 
+@functools.lru_cache(maxsize=1)
 def log_level() -> int:
     return getattr(
         logging,
@@ -55,7 +56,80 @@ def log_level() -> int:
 log = logging.getLogger("fuzzbucket")
 
 
+SSH_DESCRIPTION = textwrap.dedent(
+    """
+    ssh into a box, optionally passing arbitrary commands as positional
+    arguments.  Additionally, stdio streams will be inherited by the ssh
+    process in order to support piping.
+    """
+)
+
+SSH_EPILOG = textwrap.dedent(
+    """
+    NOTE: If no login is provided via the "-l" ssh option, a value will
+    be guessed based on the box image alias.
+    """
+)
+
+SCP_DESCRIPTION = textwrap.dedent(
+    """
+    scp things into or out of a box, optionally passing arbitrary commands
+    as positional arguments. Additionally, stdio streams will be inherited
+    by the scp process in order to support piping.
+    """
+)
+
+SCP_EPILOG = textwrap.dedent(
+    """
+    NOTE: If no login is provided in at least one of the source or
+    destination arguments, a value will be guessed based on the box image
+    alias.
+
+    IMPORTANT: The fully-qualified address of the box will be substituted in
+    the remaining command arguments wherever the literal "__BOX__" appears,
+    e.g.:
+
+    the command:
+        %(prog)s boxname -r ./some/local/path __BOX__:/tmp/
+
+    becomes:
+        scp -r ./some/local/path user@boxname.fully.qualified.example.com:/tmp/
+
+    the command:
+        %(prog)s boxname -r 'altuser@__BOX__:/var/log/*.log' ./some/local/path/
+
+    becomes:
+        scp -r altuser@boxname.fully.qualified.example.com:/var/log/*.log \\
+               ./some/local/path/
+    """
+)
+
+AUTH_HINT = textwrap.dedent(
+    """
+    Please run the following command with your GitHub username
+    to grant access to Fuzzbucket:
+
+        fuzzbucket-client login {github-username}
+
+    """
+)
+
+LOGIN_MESSAGE = textwrap.dedent(
+    """
+    Attempting to open the following URL in a browser:
+
+        {login_url}
+
+    Please follow the OAuth2 flow and then paste the 'secret' provided
+    by fuzzbucket.
+    """
+)
+
+
 def main(sysargs: typing.List[str] = sys.argv[:]) -> int:
+    if _wants_version(sysargs[1:]):
+        print(f"fuzzbucket-client {__version__}")
+        return 0
     client = default_client()
     parser = argparse.ArgumentParser(
         description=__doc__,
@@ -131,19 +205,8 @@ def main(sysargs: typing.List[str] = sys.argv[:]) -> int:
         help="suppress box info header",
     )
     parser_ssh.usage = "usage: %(prog)s [-hq] box [ssh-arguments]"
-    parser_ssh.description = textwrap.dedent(
-        """
-        ssh into a box, optionally passing arbitrary commands as positional
-        arguments.  Additionally, stdio streams will be inherited by the ssh
-        process in order to support piping.
-        """
-    )
-    parser_ssh.epilog = textwrap.dedent(
-        """
-        NOTE: If no login is provided via the "-l" ssh option, a value will
-        be guessed based on the box image alias.
-        """
-    )
+    parser_ssh.description = SSH_DESCRIPTION
+    parser_ssh.epilog = SSH_EPILOG
     parser_ssh.add_argument("box")
     parser_ssh.set_defaults(func=client.ssh)
 
@@ -153,37 +216,8 @@ def main(sysargs: typing.List[str] = sys.argv[:]) -> int:
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
     parser_scp.usage = "usage: %(prog)s [-h] box [scp-arguments]"
-    parser_scp.description = textwrap.dedent(
-        """
-        scp things into or out of a box, optionally passing arbitrary commands
-        as positional arguments. Additionally, stdio streams will be inherited
-        by the scp process in order to support piping.
-        """
-    )
-    parser_scp.epilog = textwrap.dedent(
-        """
-        NOTE: If no login is provided in at least one of the source or
-        destination arguments, a value will be guessed based on the box image
-        alias.
-
-        IMPORTANT: The fully-qualified address of the box will be substituted in
-        the remaining command arguments wherever the literal "__BOX__" appears,
-        e.g.:
-
-        the command:
-            %(prog)s boxname -r ./some/local/path __BOX__:/tmp/
-
-        becomes:
-            scp -r ./some/local/path user@boxname.fully.qualified.example.com:/tmp/
-
-        the command:
-            %(prog)s boxname -r 'altuser@__BOX__:/var/log/*.log' ./some/local/path/
-
-        becomes:
-            scp -r altuser@boxname.fully.qualified.example.com:/var/log/*.log \\
-                   ./some/local/path/
-        """
-    )
+    parser_scp.description = SCP_DESCRIPTION
+    parser_scp.epilog = SCP_EPILOG
     parser_scp.add_argument("box")
     parser_scp.set_defaults(func=client.scp)
 
@@ -231,18 +265,17 @@ def main(sysargs: typing.List[str] = sys.argv[:]) -> int:
     return 86
 
 
-def _print_auth_hint():
-    print(
-        textwrap.dedent(
-            """
-        Please run the following command with your GitHub username
-        to grant access to Fuzzbucket:
+def _wants_version(args: typing.List[str]) -> bool:
+    for arg in args:
+        if arg == "--version":
+            return True
+        if not arg.startswith("-"):
+            return False
+    return False
 
-            fuzzbucket-client login {github-username}
 
-        """
-        )
-    )
+def _print_auth_hint():
+    print(AUTH_HINT)
 
 
 def _pjoin(*parts: str) -> str:
@@ -268,7 +301,7 @@ def _command(method):
             return method(self, known_args, unknown_args)
         except urllib.request.HTTPError as exc:
             try:
-                response = json.load(exc)
+                response = json.loads(exc.read())
                 log.error(
                     f"command {method.__name__!r} failed err={response.get('error')!r}"
                 )
@@ -295,7 +328,7 @@ class CredentialsError(ValueError):
     def __str__(self) -> str:
         return (
             f"No credentials found for url={self.url!r} in "
-            + f"file={self.credentials_path!r}"
+            f"file={self.credentials_path!r}"
         )
 
 
@@ -321,25 +354,57 @@ class Client:
         "suse": default_ssh_user,
         "ubuntu": "ubuntu",
     }
+    max_delete_workers = 8
+    _retryable_methods = ("GET", "DELETE")
+    _sending = object()
+    _env_keys = ("FUZZBUCKET_URL",)
+    _ssh_user_prefixes = tuple(
+        sorted(default_ssh_users.items(), key=lambda item: -len(item[0]))
+    )
 
     def __init__(
         self,
         env: typing.Optional[typing.Dict[str, str]] = None,
     ):
-        self._env = env if env is not None else dict(os.environ)
-        self._cached_url_opener = None
+        self._env = (
+            env
+            if env is not None
+            else {key: os.environ[key] for key in self._env_keys if key in os.environ}
+        )
+        self._connections: typing.Dict[
+            typing.Tuple[str, str], typing.List[http.client.HTTPConnection]
+        ] = {}
+        self._connection_responses: typing.Dict[
+            http.client.HTTPConnection, typing.Any
+        ] = {}
+        self._connections_lock = threading.Lock()
         self._cached_credentials = None
+        self._cached_auth_headers = None
+        self._cached_boxes = None
+        self._box_url = None
+        self._image_alias_url = None
+        self._key_url = None
+        self._reboot_url = None
         self._patched_credentials_file = None
         self.data_format = _DataFormats.INI
 
     def _setup(self):
-        if self._url is None:
+        url = self._url
+        if url is None:
             raise ValueError("missing FUZZBUCKET_URL")
         if self._credentials in (None, ""):
-            raise CredentialsError(self._url, self._credentials_file)
+            raise CredentialsError(url, self._credentials_file)
+        base_url = url.rstrip("/")
+        self._box_url = _pjoin(base_url, "box")
+        self._image_alias_url = _pjoin(base_url, "image-alias")
+        self._key_url = _pjoin(base_url, "key")
+        self._reboot_url = _pjoin(base_url, "reboot")
 
     @_command
     def login(self, known_args, _):
+        import getpass
+        import webbrowser
+
         if self._url is None:
             raise ValueError("missing FUZZBUCKET_URL")
         log.debug(f"starting login flow for user={known_args.user}")
@@ -350,18 +415,7 @@ class Client:
             ]
         )
         webbrowser.open(login_url)
-        print(
-            textwrap.dedent(
-                f"""
-            Attempting to open the following URL in a browser:
-
-                {login_url}
-
-            Please follow the OAuth2 flow and then paste the 'secret' provided
-            by fuzzbucket.
-        """
-            )
-        )
+        print(LOGIN_MESSAGE.format(login_url=login_url))
         secret = None
         while secret is None:
             try:
@@ -378,7 +432,8 @@ class Client:
 
     @_command
     def list(self, *_):
-        log.debug(f"fetching boxes for user={self._user!r}")
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"fetching boxes for user={self._user!r}")
         boxes = self._list_boxes()
         log.info(f"fetched boxes for user={self._user!r} count={len(boxes)}")
         print(self._format_boxes(boxes), end="")
@@ -405,7 +460,7 @@ class Client:
         if known_args.name != "":
             payload["name"] = known_args.name
         req = self._build_request(
-            _pjoin(self._url, "box"),
+            self._box_url,
             data=json.dumps(payload).encode("utf-8"),
             headers={"Content-Type": "application/json"},
             method="POST",
@@ -413,33 +468,57 @@ class Client:
         raw_response = {}
         try:
             with self._urlopen(req) as response:
-                raw_response = json.load(response)
+                raw_response = json.loads(response.read())
             log.info(f"created box for user={self._user!r}")
         except urllib.request.HTTPError as exc:
             if exc.code == 409:
                 log.warning("matching box already exists")
-                raw_response = json.load(exc)
+                raw_response = json.loads(exc.read())
             else:
                 raise exc
 
+        self._cached_boxes = None
         print(self._format_boxes(raw_response["boxes"]), end="")
         return True
 
     @_command
     def delete(self, known_args, _):
+        import concurrent.futures
+
         matching_boxes = self._find_boxes(known_args.box_match)
         if matching_boxes is None:
             log.error(f"no boxes found matching {known_args.box_match!r}")
             return False
-        for matching_box in matching_boxes:
-            req = self._build_request(
-                _pjoin(self._url, "box", matching_box["instance_id"]),
-                method="DELETE",
+        user = self._user
+        deleted_boxes = []
+        self._cached_boxes = None
+        failed = []
+        try:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(self.max_delete_workers, len(matching_boxes))
+            ) as executor:
+                futures = [
+                    (matching_box, executor.submit(self._delete_box, matching_box))
+                    for matching_box in matching_boxes
+                ]
+                for matching_box, future in futures:
+                    exc = future.exception()
+                    if exc is not None:
+                        failed.append((matching_box, exc))
+                        continue
+                    log.info(
+                        f"deleted box for user={user!r} name={matching_box['name']}"
+                    )
+                    deleted_boxes.append(matching_box)
+        finally:
+            self._close_connections()
+            print(self._format_boxes(deleted_boxes), end="")
+        if len(failed) > 0:
+            log.error(
+                f"failed to delete boxes for user={user!r} "
+                f"names={[box['name'] for box, _ in failed]!r}"
             )
-            with self._urlopen(req) as response:
-                _ = response.read()
-            log.info(f"deleted box for user={self._user!r} name={matching_box['name']}")
-            print(self._format_boxes([matching_box]), end="")
+            raise failed[0][1]
         return True
 
     @_command
@@ -449,11 +528,12 @@ class Client:
             log.error(f"no box found matching {known_args.box!r}")
             return False
         req = self._build_request(
-            _pjoin(self._url, "reboot", matching_box["instance_id"]),
+            _pjoin(self._reboot_url, matching_box["instance_id"]),
             method="POST",
         )
         with self._urlopen(req) as response:
             _ = response.read()
+        self._cached_boxes = None
         log.info(f"rebooted box for user={self._user!r} box={matching_box['name']!r}")
         print(self._format_boxes([matching_box]), end="")
         return True
@@ -467,7 +547,7 @@ class Client:
         if not known_args.quiet:
             log.info(
                 f"sshing into matching_box={matching_box['name']!r} "
-                + f"ssh_command={ssh_command!r}"
+                f"ssh_command={ssh_command!r}"
             )
             print(self._format_boxes([matching_box]), end="")
         sys.stdout.flush()
@@ -483,7 +563,7 @@ class Client:
         scp_command = self._build_scp_command(matching_box, unknown_args)
         log.info(
             f"scping with matching_box={matching_box['name']!r} "
-            + f"scp_command={scp_command!r}"
+            f"scp_command={scp_command!r}"
         )
         print(self._format_boxes([matching_box]), end="")
         sys.stdout.flush()
@@ -493,10 +573,10 @@ class Client:
 
     @_command
     def list_aliases(self, *_):
-        req = self._build_request(_pjoin(self._url, "image-alias"))
+        req = self._build_request(self._image_alias_url)
         raw_response = {}
         with self._urlopen(req) as response:
-            raw_response = json.load(response)
+            raw_response = json.loads(response.read())
         if "image_aliases" not in raw_response:
             log.error("failed to fetch image aliases")
             return False
@@ -507,29 +587,28 @@ class Client:
     def create_alias(self, known_args, _):
         payload = {"alias": known_args.alias, "ami": known_args.ami}
         req = self._build_request(
-            _pjoin(self._url, "image-alias"),
+            self._image_alias_url,
             data=json.dumps(payload).encode("utf-8"),
             headers={"Content-Type": "application/json"},
             method="POST",
         )
         raw_response = {}
         with self._urlopen(req) as response:
-            raw_response = json.load(response)
-        log.debug(f"raw created alias response={raw_response!r}")
+            raw_response = json.loads(response.read())
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(f"raw created alias response={raw_response!r}")
         if "image_aliases" not in raw_response:
             log.error("failed to create image alias")
             return False
         for key, value in raw_response["image_aliases"].items():
-            log.info(
-                f"created alias for user={self._user!r} alias={key} " + f"ami={value}"
-            )
+            log.info(f"created alias for user={self._user!r} alias={key} ami={value}")
         print(self._format_image_aliases(raw_response["image_aliases"]), end="")
         return True
 
     @_command
     def delete_alias(self, known_args, _):
         req = self._build_request(
-            _pjoin(self._url, "image-alias", known_args.alias), method="DELETE"
+            _pjoin(self._image_alias_url, known_args.alias), method="DELETE"
         )
         with self._urlopen(req) as response:
             _ = response.read()
@@ -538,23 +617,30 @@ class Client:
 
     @_command
     def get_key(self, *_):
-        req = self._build_request(_pjoin(self._url, "key"), method="GET")
+        req = self._build_request(self._key_url, method="GET")
         raw_response = {}
         with self._urlopen(req) as response:
-            raw_response = json.load(response)
+            raw_response = json.loads(response.read())
         print(self._format_key(raw_response["key"]), end="")
         return True
 
     @_command
     def delete_key(self, *_):
-        req = self._build_request(_pjoin(self._url, "key"), method="DELETE")
+        req = self._build_request(self._key_url, method="DELETE")
         raw_response = {}
         with self._urlopen(req) as response:
-            raw_response = json.load(response)
+            raw_response = json.loads(response.read())
         log.info(f"deleted key for user={self._user!r}")
         print(self._format_key(raw_response["key"]), end="")
         return True
 
+    def _delete_box(self, box):
+        req = self._build_request(
+            _pjoin(self._box_url, box["instance_id"]), method="DELETE"
+        )
+        with self._urlopen(req) as response:
+            _ = response.read()
+
     def _find_box(self, box_search):
         results = self._find_boxes(box_search)
         if results is None:
@@ -563,16 +649,17 @@ class Client:
 
     def _find_boxes(self, box_search):
         boxes = self._list_boxes()
+        box_search_match = re.compile(fnmatch.translate(box_search)).match
+        debug_enabled = log.isEnabledFor(logging.DEBUG)
         results = []
         for box in boxes:
-            log.debug(f"finding box_search={box_search!r} considering box={box!r}")
-            if box.get("name") is not None and fnmatch.fnmatchcase(
-                box["name"], box_search
-            ):
+            if debug_enabled:
+                log.debug(f"finding box_search={box_search!r} considering box={box!r}")
+            if box.get("name") is not None and box_search_match(box["name"]):
                 results.append(box)
                 continue
-            if box.get("image_alias") is not None and fnmatch.fnmatchcase(
-                box["image_alias"], box_search
+            if box.get("image_alias") is not None and box_search_match(
+                box["image_alias"]
             ):
                 results.append(box)
                 continue
@@ -581,20 +668,97 @@ class Client:
         return results
 
     def _list_boxes(self):
-        req = self._build_request(self._url)
-        raw_response = {}
-        with self._urlopen(req) as response:
-            raw_response = json.load(response)
-        return raw_response["boxes"]
+        if self._cached_boxes is None:
+            req = self._build_request(self._url)
+            raw_response = {}
+            with self._urlopen(req) as response:
+                raw_response = json.loads(response.read())
+            self._cached_boxes = raw_response["boxes"]
+        return self._cached_boxes
 
-    @contextlib.contextmanager
     def _urlopen(self, request):
-        log.debug(
-            f"attempting request user={self._user!r} method={request.method!r} "
-            + f"url={request.full_url!r}"
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(
+                f"attempting request user={self._user!r} method={request.method!r} "
+                f"url={request.full_url!r}"
+            )
+        if request.type in urllib.request.getproxies() and not (
+            urllib.request.proxy_bypass(request.host)
+        ):
+            return urllib.request.urlopen(request)
+        connection = self._checkout_connection(request.type, request.host)
+        reused = connection.sock is not None
+        try:
+            try:
+                response = self._send(connection, request)
+            except (
+                http.client.RemoteDisconnected,
+                BrokenPipeError,
+                ConnectionResetError,
+            ):
+                connection.close()
+                if not reused or request.get_method() not in self._retryable_methods:
+                    raise
+                response = self._send(connection, request)
+        except Exception:
+            connection.close()
+            self._checkin_connection(connection, None)
+            raise
+        self._checkin_connection(connection, response)
+        if 300 <= response.status < 400:
+            _ = response.read()
+            return urllib.request.urlopen(request)
+        if not 200 <= response.status < 300:
+            raise urllib.request.HTTPError(
+                request.full_url,
+                response.status,
+                response.reason,
+                response.headers,
+                io.BytesIO(response.read()),
+            )
+        return response
+
+    def _checkout_connection(self, scheme, host):
+        with self._connections_lock:
+            connections = self._connections.setdefault((scheme, host), [])
+            for connection in connections:
+                response = self._connection_responses[connection]
+                if response is None or (
+                    response is not self._sending and response.isclosed()
+                ):
+                    break
+            else:
+                connection_class = (
+                    http.client.HTTPSConnection
+                    if scheme == "https"
+                    else http.client.HTTPConnection
+                )
+                connection = connection_class(host)
+                connections.append(connection)
+            self._connection_responses[connection] = self._sending
+            return connection
+
+    def _checkin_connection(self, connection, response):
+        with self._connections_lock:
+            self._connection_responses[connection] = response
+
+    def _close_connections(self):
+        with self._connections_lock:
+            for connections in self._connections.values():
+                for connection in connections:
+                    connection.close()
+            self._connections.clear()
+            self._connection_responses.clear()
+
+    @staticmethod
+    def _send(connection, request):
+        connection.request(
+            request.get_method(),
+            request.selector,
+            body=request.data,
+            headers=dict(request.header_items()),
         )
-        with urllib.request.urlopen(request) as response:
-            yield response
+        return connection.getresponse()
 
     @property
     def _url(self):
@@ -642,24 +806,33 @@ class Client:
         with self._credentials_file.open("w") as outfile:
             outfile.write(
                 "# WARNING: this file is generated "
-                + f"(last update {datetime.datetime.utcnow()})\n"
+                f"(last update {datetime.datetime.utcnow()})\n"
             )
             creds.write(outfile)
         self._cached_credentials = None
+        self._cached_auth_headers = None
+
+    @property
+    def _auth_headers(self):
+        if self._cached_auth_headers is None:
+            self._cached_auth_headers = {
+                "Fuzzbucket-User": self._credentials.split(":")[0].split("--")[0],
+                "Fuzzbucket-Secret": self._credentials.split(":")[1],
+            }
+        return self._cached_auth_headers
 
     @property
     def _user(self):
-        return self._credentials.split(":")[0].split("--")[0]
+        return self._auth_headers["Fuzzbucket-User"]
 
     @property
     def _secret(self):
-        return self._credentials.split(":")[1]
+        return self._auth_headers["Fuzzbucket-Secret"]
 
     def _build_request(self, url, data=None, headers=None, method="GET"):
         headers = headers if headers is not None else {}
         req = urllib.request.Request(url, data=data, headers=headers, method=method)
-        req.headers["Fuzzbucket-User"] = self._user
-        req.headers["Fuzzbucket-Secret"] = self._secret
+        req.headers.update(self._auth_headers)
         return req
 
     def _resolve_sshable_box(self, box):
@@ -680,8 +853,9 @@ class Client:
                     box.get("image_alias", self.default_image_alias),
                     self.default_ssh_user,
                 ),
-            ] + unknown_args
-        return ["ssh", box.get("public_dns_name")] + self._with_ssh_opts(unknown_args)
+                *unknown_args,
+            ]
+        return ["ssh", box.get("public_dns_name"), *self._with_ssh_opts(unknown_args)]
 
     def _build_scp_command(self, box, unknown_args):
         for i, value in enumerate(unknown_args):
@@ -701,41 +875,32 @@ class Client:
                 )
 
             unknown_args[i] = value.replace("__BOX__", box_value)
-        return ["scp"] + self._with_ssh_opts(unknown_args)
+        return ["scp", *self._with_ssh_opts(unknown_args)]
 
     def _with_ssh_opts(self, unknown_args: typing.List[str]) -> typing.List[str]:
-        unknown_args_string = " ".join(unknown_args)
-        if (
-            re.search(
-                " -o StrictHostKeyChecking=.+", unknown_args_string, re.IGNORECASE
-            )
-            is None
-        ):
-            unknown_args = ["-o", "StrictHostKeyChecking=no"] + unknown_args
-        if (
-            re.search(" -o UserKnownHostsFile=.+", unknown_args_string, re.IGNORECASE)
-            is None
-        ):
-            unknown_args = ["-o", "UserKnownHostsFile=/dev/null"] + unknown_args
-        return unknown_args
+        unknown_args_string = " ".join(unknown_args).lower()
+        ssh_opts: typing.List[str] = []
+        if " -o userknownhostsfile=" not in unknown_args_string:
+            ssh_opts += ["-o", "UserKnownHostsFile=/dev/null"]
+        if " -o stricthostkeychecking=" not in unknown_args_string:
+            ssh_opts += ["-o", "StrictHostKeyChecking=no"]
+        ssh_opts += unknown_args
+        return ssh_opts
 
     def _format_boxes(self, boxes):
         return getattr(self, f"_format_boxes_{self.data_format.value}")(boxes)
 
     def _format_boxes_ini(self, boxes):
-        boxes_ini = configparser.ConfigParser()
+        parts = []
         for box in boxes:
-            boxes_ini.add_section(box["name"])
-            if box.get("public_ip") is None:
-                box["public_ip"] = "(pending)"
+            parts.append(f"[{box['name']}]\n")
+            box = {**box, "public_ip": box.get("public_ip") or "(pending)"}
             for key, value in box.items():
                 if value is None:
                     continue
-                boxes_ini.set(box["name"], str(key), str(value))
-        buf = io.StringIO()
-        boxes_ini.write(buf)
-        buf.seek(0)
-        return buf.read()
+                parts.append(f"{key} = {value}\n")
+            parts.append("\n")
+        return "".join(parts)
 
     def _format_boxes_json(self, boxes):
         return json.dumps({"boxes": {box["name"]: box for box in boxes}}, indent=2)
@@ -750,8 +915,7 @@ class Client:
             key_ini.set("key", str(attr), str(key[attr]))
         buf = io.StringIO()
         key_ini.write(buf)
-        buf.seek(0)
-        return buf.read()
+        return buf.getvalue()
 
     def _format_key_json(self, key):
         return json.dumps({"key": key}, indent=2)
@@ -762,22 +926,20 @@ class Client:
         )
 
     def _format_image_aliases_ini(self, image_aliases):
-        image_aliases_ini = configparser.ConfigParser()
-        image_aliases_ini.add_section("image_aliases")
+        parts = ["[image_aliases]\n"]
         for alias, ami in sorted(image_aliases.items()):
-            image_aliases_ini.set("image_aliases", alias, ami)
-        buf = io.StringIO()
-        image_aliases_ini.write(buf)
-        buf.seek(0)
-        return buf.read()
+            parts.append(f"{alias} = {ami}\n")
+        parts.append("\n")
+        return "".join(parts)
 
     def _format_image_aliases_json(self, image_aliases):
         return json.dumps({"image_aliases": dict(image_aliases)}, indent=2)
 
     @classmethod
+    @functools.lru_cache(maxsize=32)
     def _guess_ssh_user(cls, image_alias, default=default_ssh_user):
         image_alias = image_alias.lower()
-        for prefix, user in cls.default_ssh_users.items():
+        for prefix, user in cls._ssh_user_prefixes:
             if image_alias.startswith(prefix):
                 return user
         return default
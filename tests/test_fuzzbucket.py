@@ -1,5 +1,6 @@
 import base64
 import collections
+import dataclasses
 import json
 import os
 import random
@@ -12,7 +13,6 @@ import botocore.exceptions
 import pytest
 
 from flask import Response
-from moto import mock_ec2, mock_dynamodb2
 from werkzeug.exceptions import InternalServerError
 
 import fuzzbucket
@@ -31,6 +31,11 @@ FakeRequest = collections.namedtuple(
 )
 WrappedError = collections.namedtuple("WrappedError", ("original_exception",))
 
+AUTHD_HEADERS = (("Fuzzbucket-User", "pytest"), ("Fuzzbucket-Secret", "zzz"))
+OTHER_USER_AUTH_HEADERS = (
+    ("Authorization", base64.b64encode(b"jag:wagon").decode("utf-8")),
+)
+
 
 @pytest.fixture(autouse=True)
 def resetti():
@@ -46,9 +51,44 @@ def resetti():
     fuzzbucket.app.app.config["gh_blueprint"].storage = gh_storage
 
 
+@pytest.fixture(scope="module")
+def aws():
+    from moto import mock_dynamodb2, mock_ec2
+
+    with mock_ec2(), mock_dynamodb2():
+        yield
+
+
+@pytest.fixture(scope="module")
+def aws_session(aws):
+    return boto3.Session(region_name="us-east-1")
+
+
+@pytest.fixture(scope="module")
+def ec2_client(aws_session):
+    return aws_session.client("ec2")
+
+
+@pytest.fixture(scope="module")
+def dynamodb_resource(aws_session):
+    return aws_session.resource("dynamodb")
+
+
 @pytest.fixture
-def authd_headers() -> typing.List[typing.Tuple[str, str]]:
-    return [("Fuzzbucket-User", "pytest"), ("Fuzzbucket-Secret", "zzz")]
+def dynamodb(dynamodb_resource):
+    yield dynamodb_resource
+    for table in dynamodb_resource.tables.all():
+        table.delete()
+
+
+@pytest.fixture
+def dynamodb_tables(dynamodb):
+    setup_dynamodb_tables(dynamodb)
+
+
+@pytest.fixture(scope="session")
+def authd_headers() -> typing.Tuple[typing.Tuple[str, str], ...]:
+    return AUTHD_HEADERS
 
 
 @pytest.fixture
@@ -87,7 +127,7 @@ def fake_github():
     return FakeGithub()
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def pubkey() -> str:
     return "".join(
         [
@@ -106,26 +146,35 @@ def setup_dynamodb_tables(dynamodb):
     table = dynamodb.create_table(
         AttributeDefinitions=[dict(AttributeName="alias", AttributeType="S")],
         KeySchema=[dict(AttributeName="alias", KeyType="HASH")],
+        ProvisionedThroughput=dict(ReadCapacityUnits=1, WriteCapacityUnits=1),
         TableName=image_aliases_table,
     )
     table.meta.client.get_waiter("table_exists").wait(TableName=image_aliases_table)
 
-    for alias, ami in {
-        "ubuntu18": "ami-fafafafafaf",
-        "rhel8": "ami-fafafafafaa",
-    }.items():
-        table.put_item(Item=dict(user="pytest", alias=alias, ami=ami))
-
     users_table = os.getenv("FUZZBUCKET_USERS_TABLE_NAME")
     table = dynamodb.create_table(
         AttributeDefinitions=[dict(AttributeName="user", AttributeType="S")],
         KeySchema=[dict(AttributeName="user", KeyType="HASH")],
+        ProvisionedThroughput=dict(ReadCapacityUnits=1, WriteCapacityUnits=1),
         TableName=users_table,
     )
     table.meta.client.get_waiter("table_exists").wait(TableName=users_table)
 
-    for user, secret in {"pytest": "zzz", "nerf": "herder"}.items():
-        table.put_item(Item=dict(user=user, secret=secret))
+    dynamodb.batch_write_item(
+        RequestItems={
+            image_aliases_table: [
+                dict(PutRequest=dict(Item=dict(user="pytest", alias=alias, ami=ami)))
+                for alias, ami in {
+                    "ubuntu18": "ami-fafafafafaf",
+                    "rhel8": "ami-fafafafafaa",
+                }.items()
+            ],
+            users_table: [
+                dict(PutRequest=dict(Item=dict(user=user, secret=secret)))
+                for user, secret in {"pytest": "zzz", "nerf": "herder"}.items()
+            ],
+        }
+    )
 
 
 def test_deferred_app():
@@ -216,7 +265,6 @@ def test_json_encoder():
     assert enc(other) == '["odelay", ["mut", "ati", "ons"]]'
 
 
-@mock_ec2
 def test_list_vpc_boxes(monkeypatch):
     state = {}
 
@@ -551,13 +599,10 @@ def test_auth_complete(
         pytest.param(False, 403, id="forbidden"),
     ],
 )
-@mock_ec2
-@mock_dynamodb2
-def test_list_boxes(authd_headers, monkeypatch, authd, expected):
-    dynamodb = boto3.resource("dynamodb")
-    setup_dynamodb_tables(dynamodb)
+@pytest.mark.usefixtures("dynamodb_tables")
+def test_list_boxes(ec2_client, dynamodb, authd_headers, monkeypatch, authd, expected):
     monkeypatch.setattr(fuzzbucket.app, "get_dynamodb", lambda: dynamodb)
-    monkeypatch.setattr(fuzzbucket.app, "get_ec2_client", lambda: boto3.client("ec2"))
+    monkeypatch.setattr(fuzzbucket.app, "get_ec2_client", lambda: ec2_client)
     monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: authd)
 
     response = None
@@ -566,9 +611,10 @@ def test_list_boxes(authd_headers, monkeypatch, authd, expected):
     assert response is not None
     assert response.status_code == expected
     if authd:
-        assert response.json is not None
-        assert "boxes" in response.json
-        assert response.json["boxes"] is not None
+        body = response.json
+        assert body is not None
+        assert "boxes" in body
+        assert body["boxes"] is not None
 
 
 @pytest.mark.parametrize(
@@ -582,35 +628,74 @@ def test_list_boxes(authd_headers, monkeypatch, authd, expected):
         pytest.param(False, 403, id="forbidden"),
     ],
 )
-@mock_ec2
-@mock_dynamodb2
-def test_create_box(authd_headers, monkeypatch, pubkey, authd, expected):
-    monkeypatch.setattr(fuzzbucket.app, "get_ec2_client", lambda: boto3.client("ec2"))
-    dynamodb = boto3.resource("dynamodb")
-    setup_dynamodb_tables(dynamodb)
+@pytest.mark.usefixtures("dynamodb_tables")
+def test_create_box(
+    ec2_client, dynamodb, authd_headers, monkeypatch, pubkey, authd, expected
+):
+    monkeypatch.setattr(fuzzbucket.app, "get_ec2_client", lambda: ec2_client)
     monkeypatch.setattr(fuzzbucket.app, "get_dynamodb", lambda: dynamodb)
     monkeypatch.setattr(
         fuzzbucket.flask_dance_storage, "get_dynamodb", lambda: dynamodb
     )
     monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: authd)
 
+    monkeypatch.setattr(fuzzbucket.app, "_fetch_first_github_rsa_key", lambda u: pubkey)
+
     response = None
-    with monkeypatch.context() as mp:
-        mp.setattr(fuzzbucket.app, "_fetch_first_github_rsa_key", lambda u: pubkey)
-        with app.test_client() as c:
-            response = c.post(
-                "/box",
-                json={"ami": "ami-fafafafafaf"},
-                headers=authd_headers,
-            )
+    with app.test_client() as c:
+        response = c.post(
+            "/box",
+            json={"ami": "ami-fafafafafaf"},
+            headers=authd_headers,
+        )
     assert response is not None
     assert response.status_code == expected
     if authd:
-        assert response.json is not None
-        assert "boxes" in response.json
-        assert response.json["boxes"] != []
+        body = response.json
+        assert body is not None
+        assert "boxes" in body
+        assert body["boxes"] != []
+
+
+@pytest.fixture
+def client():
+    with app.test_client() as c:
+        yield c
+
+
+@pytest.fixture
+def created_box(
+    client, ec2_client, dynamodb, dynamodb_tables, authd_headers, monkeypatch, pubkey
+) -> str:
+    monkeypatch.setattr(fuzzbucket.app, "get_ec2_client", lambda: ec2_client)
+    monkeypatch.setattr(fuzzbucket.app, "get_dynamodb", lambda: dynamodb)
+    monkeypatch.setattr(
+        fuzzbucket.flask_dance_storage, "get_dynamodb", lambda: dynamodb
+    )
+    monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: True)
+    monkeypatch.setattr(fuzzbucket.app, "_fetch_first_github_rsa_key", lambda u: pubkey)
+
+    response = client.post(
+        "/box", json={"ami": "ami-fafafafafaf"}, headers=authd_headers
+    )
+    assert response.status_code == 201
+    body = response.json
+    assert body is not None
+
+    describe_instances = ec2_client.describe_instances
+
+    def describe_instances_any_vpc(*, Filters=(), **kwargs):
+        # moto does not track the vpc of instances launched with network interfaces
+        return describe_instances(
+            Filters=[f for f in Filters if f["Name"] != "vpc-id"], **kwargs
+        )
+
+    monkeypatch.setattr(ec2_client, "describe_instances", describe_instances_any_vpc)
+
+    return body["boxes"][0]["instance_id"]
 
 
+@pytest.mark.integration
 @pytest.mark.parametrize(
     ("authd", "expected"),
     [
@@ -622,49 +707,16 @@ def test_create_box(authd_headers, monkeypatch, pubkey, authd, expected):
         pytest.param(False, 403, id="forbidden"),
     ],
 )
-@mock_ec2
-@mock_dynamodb2
-def test_delete_box(authd_headers, monkeypatch, pubkey, authd, expected):
-    ec2_client = boto3.client("ec2")
-    monkeypatch.setattr(fuzzbucket.app, "get_ec2_client", lambda: ec2_client)
-    dynamodb = boto3.resource("dynamodb")
-    setup_dynamodb_tables(dynamodb)
-    monkeypatch.setattr(fuzzbucket.app, "get_dynamodb", lambda: dynamodb)
-    monkeypatch.setattr(
-        fuzzbucket.flask_dance_storage, "get_dynamodb", lambda: dynamodb
+def test_delete_box(client, created_box, authd_headers, monkeypatch, authd, expected):
+    monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: authd)
+    response = client.delete(
+        f"/box/{created_box}",
+        headers=authd_headers,
     )
-    monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: True)
-
-    response = None
-    with monkeypatch.context() as mp:
-        mp.setattr(fuzzbucket.app, "_fetch_first_github_rsa_key", lambda u: pubkey)
-        with app.test_client() as c:
-            response = c.post(
-                "/box", json={"ami": "ami-fafafafafaf"}, headers=authd_headers
-            )
-    assert response is not None
-    assert "boxes" in response.json
-
-    with app.test_client() as c:
-        all_instances = ec2_client.describe_instances()
-
-        def fake_describe_instances(*_args, **_kwargs):
-            return all_instances
-
-        monkeypatch.setattr(
-            ec2_client,
-            "describe_instances",
-            fake_describe_instances,
-        )
-        monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: authd)
-        response = c.delete(
-            f'/box/{response.json["boxes"][0]["instance_id"]}',
-            headers=authd_headers,
-        )
-        assert response.status_code == expected
+    assert response.status_code == expected
 
 
-@mock_ec2
+@pytest.mark.usefixtures("aws")
 def test_delete_box_not_yours(monkeypatch, authd_headers, fake_github):
     def fake_list_user_boxes(*_):
         return []
@@ -680,10 +732,12 @@ def test_delete_box_not_yours(monkeypatch, authd_headers, fake_github):
 
     assert response is not None
     assert response.status_code == 403
-    assert "error" in response.json
-    assert response.json["error"] == "no touching"
+    body = response.json
+    assert "error" in body
+    assert body["error"] == "no touching"
 
 
+@pytest.mark.integration
 @pytest.mark.parametrize(
     ("authd", "expected"),
     [
@@ -695,50 +749,16 @@ def test_delete_box_not_yours(monkeypatch, authd_headers, fake_github):
         pytest.param(False, 403, id="forbidden"),
     ],
 )
-@mock_ec2
-@mock_dynamodb2
-def test_reboot_box(authd_headers, monkeypatch, pubkey, authd, expected):
-    ec2_client = boto3.client("ec2")
-    monkeypatch.setattr(fuzzbucket.app, "get_ec2_client", lambda: ec2_client)
-    dynamodb = boto3.resource("dynamodb")
-    setup_dynamodb_tables(dynamodb)
-    monkeypatch.setattr(fuzzbucket.app, "get_dynamodb", lambda: dynamodb)
-    monkeypatch.setattr(
-        fuzzbucket.flask_dance_storage, "get_dynamodb", lambda: dynamodb
+def test_reboot_box(client, created_box, authd_headers, monkeypatch, authd, expected):
+    monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: authd)
+    response = client.post(
+        f"/reboot/{created_box}",
+        headers=authd_headers,
     )
-    monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: True)
-
-    response = None
-    with monkeypatch.context() as mp:
-        mp.setattr(fuzzbucket.app, "_fetch_first_github_rsa_key", lambda u: pubkey)
-        with app.test_client() as c:
-            response = c.post(
-                "/box", json={"ami": "ami-fafafafafaf"}, headers=authd_headers
-            )
-    assert response is not None
-    assert "boxes" in response.json
-
-    with app.test_client() as c:
-        all_instances = ec2_client.describe_instances()
-        with monkeypatch.context() as mp:
-
-            def fake_describe_instances(*_args, **_kwargs):
-                return all_instances
-
-            mp.setattr(
-                ec2_client,
-                "describe_instances",
-                fake_describe_instances,
-            )
-            mp.setattr(fuzzbucket.app, "is_fully_authd", lambda: authd)
-            response = c.post(
-                f'/reboot/{response.json["boxes"][0]["instance_id"]}',
-                headers=authd_headers,
-            )
-            assert response.status_code == expected
+    assert response.status_code == expected
 
 
-@mock_ec2
+@pytest.mark.usefixtures("aws")
 def test_reboot_box_not_yours(monkeypatch):
     def fake_list_user_boxes(*_):
         return []
@@ -751,8 +771,9 @@ def test_reboot_box_not_yours(monkeypatch):
         response = c.post("/reboot/i-fafafafaf")
     assert response is not None
     assert response.status_code == 403
-    assert "error" in response.json
-    assert response.json["error"] == "no touching"
+    body = response.json
+    assert "error" in body
+    assert body["error"] == "no touching"
 
 
 @pytest.mark.parametrize(
@@ -766,10 +787,8 @@ def test_reboot_box_not_yours(monkeypatch):
         pytest.param(False, 403, id="forbidden"),
     ],
 )
-@mock_dynamodb2
-def test_list_image_aliases(authd_headers, monkeypatch, authd, expected):
-    dynamodb = boto3.resource("dynamodb")
-    setup_dynamodb_tables(dynamodb)
+@pytest.mark.usefixtures("dynamodb_tables")
+def test_list_image_aliases(dynamodb, authd_headers, monkeypatch, authd, expected):
     monkeypatch.setattr(fuzzbucket.app, "get_dynamodb", lambda: dynamodb)
     monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: authd)
 
@@ -791,10 +810,8 @@ def test_list_image_aliases(authd_headers, monkeypatch, authd, expected):
         pytest.param(False, 403, id="forbidden"),
     ],
 )
-@mock_dynamodb2
-def test_create_image_alias(authd_headers, monkeypatch, authd, expected):
-    dynamodb = boto3.resource("dynamodb")
-    setup_dynamodb_tables(dynamodb)
+@pytest.mark.usefixtures("dynamodb_tables")
+def test_create_image_alias(dynamodb, authd_headers, monkeypatch, authd, expected):
     monkeypatch.setattr(fuzzbucket.app, "get_dynamodb", lambda: dynamodb)
     monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: authd)
 
@@ -809,10 +826,8 @@ def test_create_image_alias(authd_headers, monkeypatch, authd, expected):
     assert response.status_code == expected
 
 
-@mock_dynamodb2
-def test_create_image_alias_not_json(authd_headers, monkeypatch):
-    dynamodb = boto3.resource("dynamodb")
-    setup_dynamodb_tables(dynamodb)
+@pytest.mark.usefixtures("dynamodb_tables")
+def test_create_image_alias_not_json(dynamodb, authd_headers, monkeypatch):
     monkeypatch.setattr(fuzzbucket.app, "get_dynamodb", lambda: dynamodb)
     monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: True)
 
@@ -831,10 +846,8 @@ def test_create_image_alias_not_json(authd_headers, monkeypatch):
     ("authd", "expected"),
     [pytest.param(True, 204, id="happy"), pytest.param(False, 403, id="forbidden")],
 )
-@mock_dynamodb2
-def test_delete_image_alias(authd_headers, monkeypatch, authd, expected):
-    dynamodb = boto3.resource("dynamodb")
-    setup_dynamodb_tables(dynamodb)
+@pytest.mark.usefixtures("dynamodb_tables")
+def test_delete_image_alias(dynamodb, authd_headers, monkeypatch, authd, expected):
     monkeypatch.setattr(fuzzbucket.app, "get_dynamodb", lambda: dynamodb)
     monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: authd)
 
@@ -845,10 +858,8 @@ def test_delete_image_alias(authd_headers, monkeypatch, authd, expected):
     assert response.status_code == expected
 
 
-@mock_dynamodb2
-def test_delete_image_alias_no_alias(authd_headers, monkeypatch):
-    dynamodb = boto3.resource("dynamodb")
-    setup_dynamodb_tables(dynamodb)
+@pytest.mark.usefixtures("dynamodb_tables")
+def test_delete_image_alias_no_alias(dynamodb, authd_headers, monkeypatch):
     monkeypatch.setattr(fuzzbucket.app, "get_dynamodb", lambda: dynamodb)
     monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: True)
 
@@ -859,10 +870,8 @@ def test_delete_image_alias_no_alias(authd_headers, monkeypatch):
     assert response.status_code == 404
 
 
-@mock_dynamodb2
-def test_delete_image_alias_not_yours(monkeypatch):
-    dynamodb = boto3.resource("dynamodb")
-    setup_dynamodb_tables(dynamodb)
+@pytest.mark.usefixtures("dynamodb_tables")
+def test_delete_image_alias_not_yours(dynamodb, monkeypatch):
     monkeypatch.setattr(fuzzbucket.app, "get_dynamodb", lambda: dynamodb)
     monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: True)
 
@@ -870,12 +879,13 @@ def test_delete_image_alias_not_yours(monkeypatch):
     with app.test_client() as c:
         response = c.delete(
             "/image-alias/ubuntu18",
-            headers=[("Authorization", base64.b64encode(b"jag:wagon").decode("utf-8"))],
+            headers=OTHER_USER_AUTH_HEADERS,
         )
     assert response is not None
     assert response.status_code == 403
-    assert "error" in response.json
-    assert response.json["error"] == "no touching"
+    body = response.json
+    assert "error" in body
+    assert body["error"] == "no touching"
 
 
 @pytest.mark.parametrize(
@@ -896,12 +906,10 @@ def test_delete_image_alias_not_yours(monkeypatch):
         pytest.param(False, "foible", 403, id="forbidden"),
     ],
 )
-@mock_ec2
-@mock_dynamodb2
-def test_get_key(authd_headers, monkeypatch, authd, session_user, expected):
-    ec2_client = boto3.client("ec2")
-    dynamodb = boto3.resource("dynamodb")
-    setup_dynamodb_tables(dynamodb)
+@pytest.mark.usefixtures("dynamodb_tables")
+def test_get_key(
+    ec2_client, dynamodb, authd_headers, monkeypatch, authd, session_user, expected
+):
     monkeypatch.setattr(fuzzbucket.app, "get_dynamodb", lambda: dynamodb)
     monkeypatch.setattr(fuzzbucket.app, "get_ec2_client", lambda: ec2_client)
     monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: authd)
@@ -928,9 +936,10 @@ def test_get_key(authd_headers, monkeypatch, authd, session_user, expected):
     assert response is not None
     assert response.status_code == expected
     if authd and expected < 400:
-        assert response.json is not None
-        assert "key" in response.json
-        assert response.json["key"] is not None
+        body = response.json
+        assert body is not None
+        assert "key" in body
+        assert body["key"] is not None
 
 
 @pytest.mark.parametrize(
@@ -951,12 +960,10 @@ def test_get_key(authd_headers, monkeypatch, authd, session_user, expected):
         pytest.param(False, "foible", 403, id="forbidden"),
     ],
 )
-@mock_ec2
-@mock_dynamodb2
-def test_delete_key(authd_headers, monkeypatch, authd, session_user, expected):
-    ec2_client = boto3.client("ec2")
-    dynamodb = boto3.resource("dynamodb")
-    setup_dynamodb_tables(dynamodb)
+@pytest.mark.usefixtures("dynamodb_tables")
+def test_delete_key(
+    ec2_client, dynamodb, authd_headers, monkeypatch, authd, session_user, expected
+):
     monkeypatch.setattr(fuzzbucket.app, "get_dynamodb", lambda: dynamodb)
     monkeypatch.setattr(fuzzbucket.app, "get_ec2_client", lambda: ec2_client)
     monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: authd)
@@ -983,12 +990,12 @@ def test_delete_key(authd_headers, monkeypatch, authd, session_user, expected):
     assert response is not None
     assert response.status_code == expected
     if authd and expected < 400:
-        assert response.json is not None
-        assert "key" in response.json
-        assert response.json["key"] is not None
+        body = response.json
+        assert body is not None
+        assert "key" in body
+        assert body["key"] is not None
 
 
-@mock_dynamodb2
 @pytest.mark.parametrize(
     ("image_alias", "raises", "expected"),
     [
@@ -997,11 +1004,10 @@ def test_delete_key(authd_headers, monkeypatch, authd, session_user, expected):
         pytest.param("rhel8", False, "ami-fafafafafaa", id="valid"),
     ],
 )
-def test_resolve_ami_alias(monkeypatch, image_alias, raises, expected):
+def test_resolve_ami_alias(dynamodb, monkeypatch, image_alias, raises, expected):
     table_name = "just_imagine"
     monkeypatch.setenv("FUZZBUCKET_IMAGE_ALIASES_TABLE_NAME", table_name)
 
-    dynamodb = boto3.resource("dynamodb")
     monkeypatch.setattr(fuzzbucket.app, "get_dynamodb", lambda: dynamodb)
     setup_dynamodb_tables(dynamodb)
 
@@ -1057,103 +1063,70 @@ def test_fetch_first_github_rsa_key(monkeypatch, raises, api_response, expected_
     assert fuzzbucket.app._fetch_first_github_rsa_key("user") == expected_key
 
 
-@mock_ec2
-@mock_dynamodb2
-def test_reap_boxes(authd_headers, monkeypatch, pubkey):
-    monkeypatch.setattr(fuzzbucket.app, "get_ec2_client", lambda: boto3.client("ec2"))
-    monkeypatch.setattr(
-        fuzzbucket.reaper, "get_ec2_client", lambda: boto3.client("ec2")
-    )
-    dynamodb = boto3.resource("dynamodb")
-    setup_dynamodb_tables(dynamodb)
+@pytest.mark.integration
+@pytest.mark.usefixtures("dynamodb_tables")
+def test_reap_boxes(ec2_client, dynamodb, authd_headers, monkeypatch, pubkey):
+    monkeypatch.setattr(fuzzbucket.app, "get_ec2_client", lambda: ec2_client)
+    monkeypatch.setattr(fuzzbucket.reaper, "get_ec2_client", lambda: ec2_client)
     monkeypatch.setattr(fuzzbucket.app, "get_dynamodb", lambda: dynamodb)
     monkeypatch.setattr(
         fuzzbucket.flask_dance_storage, "get_dynamodb", lambda: dynamodb
     )
     monkeypatch.setattr(fuzzbucket.app, "is_fully_authd", lambda: True)
+    monkeypatch.setattr(fuzzbucket.app, "_fetch_first_github_rsa_key", lambda u: pubkey)
 
     response = None
-    with monkeypatch.context() as mp:
-        mp.setattr(fuzzbucket.app, "_fetch_first_github_rsa_key", lambda u: pubkey)
-        with app.test_client() as c:
-            response = c.post(
-                "/box",
-                json={"ttl": "-1", "ami": "ami-fafafafafaf"},
-                headers=authd_headers,
-            )
+    with app.test_client() as c:
+        response = c.post(
+            "/box",
+            json={"ttl": "-1", "ami": "ami-fafafafafaf"},
+            headers=authd_headers,
+        )
     assert response is not None
-    assert "boxes" in response.json
-    instance_id = response.json["boxes"][0]["instance_id"]
+    body = response.json
+    assert "boxes" in body
+    instance_id = body["boxes"][0]["instance_id"]
     assert instance_id != ""
 
     the_future = time.time() + 3600
 
-    with monkeypatch.context() as mp:
-        ec2_client = boto3.client("ec2")
-
-        def fake_list_vpc_boxes(ec2_client, vpc_id):
-            ret = []
-            for box_dict in response.json["boxes"]:
-                if "age" in box_dict:
-                    box_dict.pop("age")
-                box = Box(**box_dict)
-                box.created_at = None
-                ret.append(box)
-            return ret
-
-        mp.setattr(time, "time", lambda: the_future)
-        mp.setattr(fuzzbucket.reaper, "list_vpc_boxes", fake_list_vpc_boxes)
-        reap_response = fuzzbucket.reaper.reap_boxes(
-            None, None, ec2_client=ec2_client, env={"CF_VPC": "vpc-fafafafafaf"}
-        )
-        assert reap_response["reaped_instance_ids"] == []
-
-    with monkeypatch.context() as mp:
-        ec2_client = boto3.client("ec2")
-
-        def fake_list_vpc_boxes(ec2_client, vpc_id):
-            ret = []
-            for box_dict in response.json["boxes"]:
-                if "age" in box_dict:
-                    box_dict.pop("age")
-                box = Box(**box_dict)
-                box.ttl = None
-                ret.append(box)
-            return ret
-
-        mp.setattr(time, "time", lambda: the_future)
-        mp.setattr(fuzzbucket.reaper, "list_vpc_boxes", fake_list_vpc_boxes)
-        reap_response = fuzzbucket.reaper.reap_boxes(
-            None, None, ec2_client=ec2_client, env={"CF_VPC": "vpc-fafafafafaf"}
-        )
-        assert reap_response["reaped_instance_ids"] == []
-
-    with monkeypatch.context() as mp:
-        ec2_client = boto3.client("ec2")
-
-        def fake_list_vpc_boxes(ec2_client, vpc_id):
-            ret = []
-            for box_dict in response.json["boxes"]:
-                if "age" in box_dict:
-                    box_dict.pop("age")
-                box = Box(**box_dict)
-                ret.append(box)
-            return ret
-
-        mp.setattr(time, "time", lambda: the_future)
-        mp.setattr(fuzzbucket.reaper, "list_vpc_boxes", fake_list_vpc_boxes)
-        reap_response = fuzzbucket.reaper.reap_boxes(
-            None, None, ec2_client=ec2_client, env={"CF_VPC": "vpc-fafafafafaf"}
-        )
-        assert reap_response["reaped_instance_ids"] != []
-
-    assert instance_id not in [
-        box.instance_id
-        for box in fuzzbucket.list_boxes_filtered(
-            ec2_client, fuzzbucket.DEFAULT_FILTERS
-        )
+    boxes = [
+        Box(**{key: value for key, value in box_dict.items() if key != "age"})
+        for box_dict in body["boxes"]
     ]
 
+    undated_boxes = [dataclasses.replace(box, created_at=None) for box in boxes]
+    monkeypatch.setattr(fuzzbucket.reaper, "list_vpc_boxes", lambda *_: undated_boxes)
+    reap_response = fuzzbucket.reaper.reap_boxes(
+        None,
+        None,
+        ec2_client=ec2_client,
+        env={"CF_VPC": "vpc-fafafafafaf"},
+        now=the_future,
+    )
+    assert reap_response["reaped_instance_ids"] == []
+
+    ttl_less_boxes = [dataclasses.replace(box, ttl=None) for box in boxes]
+    monkeypatch.setattr(fuzzbucket.reaper, "list_vpc_boxes", lambda *_: ttl_less_boxes)
+    reap_response = fuzzbucket.reaper.reap_boxes(
+        None,
+        None,
+        ec2_client=ec2_client,
+        env={"CF_VPC": "vpc-fafafafafaf"},
+        now=the_future,
+    )
+    assert reap_response["reaped_instance_ids"] == []
+
+    monkeypatch.setattr(fuzzbucket.reaper, "list_vpc_boxes", lambda *_: boxes)
+    reap_response = fuzzbucket.reaper.reap_boxes(
+        None,
+        None,
+        ec2_client=ec2_client,
+        env={"CF_VPC": "vpc-fafafafafaf"},
+        now=the_future,
+    )
+    assert reap_response["reaped_instance_ids"] == [instance_id]
+
 
 def test_box():
     box = Box(instance_id="i-fafafafafafafaf")
@@ -1183,10 +1156,8 @@ def test_box():
         pytest.param(None, "busytown1999", True, {}, id="no_user"),
     ],
 )
-@mock_dynamodb2
-def test_flask_dance_storage(monkeypatch, user, token, raises, expected):
-    dynamodb = boto3.resource("dynamodb")
-    setup_dynamodb_tables(dynamodb)
+@pytest.mark.usefixtures("dynamodb_tables")
+def test_flask_dance_storage(dynamodb, monkeypatch, user, token, raises, expected):
     monkeypatch.setattr(
         fuzzbucket.flask_dance_storage, "get_dynamodb", lambda: dynamodb
     )
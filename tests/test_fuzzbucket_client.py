@@ -1,12 +1,18 @@
 import argparse
+import configparser
 import contextlib
+import getpass
+import http.server
 import io
 import json
 import logging
 import os
+import pathlib
 import random
 import re
+import threading
 import urllib.request
+import webbrowser
 
 import pytest
 
@@ -44,6 +50,146 @@ def test_client_setup():
         client._setup()
 
 
+def test_client_setup_urls(monkeypatch):
+    client = fuzzbucket_client.__main__.Client()
+    url = client._env["FUZZBUCKET_URL"]
+    client._setup()
+    assert client._box_url == f"{url}/box"
+    assert client._image_alias_url == f"{url}/image-alias"
+    assert client._key_url == f"{url}/key"
+    assert client._reboot_url == f"{url}/reboot"
+
+    monkeypatch.setattr(client, "_read_credentials", lambda: "whimsy:doodles")
+    client._env["FUZZBUCKET_URL"] = f"{url}/"
+    client._setup()
+    assert client._box_url == f"{url}/box"
+
+
+def test_client__build_request():
+    client = fuzzbucket_client.__main__.Client()
+    client._setup()
+    req = client._build_request("http://fuzzbucket.example.org/box")
+    assert req.headers["Fuzzbucket-User"] == "whimsy"
+    assert req.headers["Fuzzbucket-Secret"] == "doodles"
+    assert client._cached_auth_headers is not None
+    assert client._user == "whimsy"
+
+
+@pytest.fixture
+def keepalive_server():
+    state = {"requests": []}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *_):
+            pass
+
+        def _respond(self):
+            _ = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            seen = [path for _, path, _ in state["requests"]]
+            state["requests"].append((self.command, self.path, self.client_address))
+            if self.path.endswith("/reset-once") and self.path not in seen:
+                self.close_connection = True
+                return
+            if self.path.endswith("/moved"):
+                self.send_response(301)
+                self.send_header("Location", "/box")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            status = 403 if self.path.endswith("/nope") else 200
+            body = json.dumps(
+                {"error": "no touching"} if status == 403 else {}
+            ).encode()
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        do_GET = do_DELETE = do_POST = _respond
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{server.server_port}"
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def keepalive_client(monkeypatch, keepalive_server):
+    for key in ("http_proxy", "HTTP_PROXY"):
+        monkeypatch.delenv(key, raising=False)
+    url = keepalive_server["url"]
+    monkeypatch.setenv("FUZZBUCKET_URL", url)
+    (pathlib.Path(os.environ["HOME"]) / ".cache/fuzzbucket/credentials").write_text(
+        f'[server "{url}"]\ncredentials = whimsy:doodles\n'
+    )
+    client = fuzzbucket_client.__main__.Client()
+    client._setup()
+    yield client
+    client._close_connections()
+
+
+def test_client__urlopen(keepalive_client, keepalive_server):
+    client = keepalive_client
+    for method in ("GET", "DELETE", "GET"):
+        request = client._build_request(client._box_url, method=method)
+        with client._urlopen(request) as response:
+            assert json.loads(response.read()) == {}
+
+    with pytest.raises(urllib.request.HTTPError) as exc_info:
+        client._urlopen(client._build_request(f"{client._box_url}/nope"))
+    assert exc_info.value.code == 403
+    assert json.loads(exc_info.value.read()) == {"error": "no touching"}
+
+    requests = keepalive_server["requests"]
+    assert [(method, path) for method, path, _ in requests] == [
+        ("GET", "/box"),
+        ("DELETE", "/box"),
+        ("GET", "/box"),
+        ("GET", "/box/nope"),
+    ]
+    assert len({address for _, _, address in requests}) == 1
+
+
+@pytest.mark.parametrize(
+    ("method", "retried"),
+    [
+        pytest.param("GET", True, id="get"),
+        pytest.param("DELETE", True, id="delete"),
+        pytest.param("POST", False, id="post"),
+    ],
+)
+def test_client__urlopen_reset(keepalive_client, keepalive_server, method, retried):
+    client = keepalive_client
+    with client._urlopen(client._build_request(client._box_url)) as response:
+        _ = response.read()
+
+    request = client._build_request(
+        f"{client._box_url}/reset-once", data=b"{}", method=method
+    )
+    if retried:
+        with client._urlopen(request) as response:
+            assert json.loads(response.read()) == {}
+    else:
+        with pytest.raises(ConnectionError):
+            client._urlopen(request)
+
+    sent = [m for m, path, _ in keepalive_server["requests"] if path != "/box"]
+    assert sent == [method] * (2 if retried else 1)
+
+
+def test_client__urlopen_redirect(keepalive_client, keepalive_server):
+    client = keepalive_client
+    request = client._build_request(f"{client._box_url}/moved")
+    with client._urlopen(request) as response:
+        assert json.loads(response.read()) == {}
+    assert [path for _, path, _ in keepalive_server["requests"]][-1] == "/box"
+
+
 def gen_fake_urlopen(response, http_exc=None, empty_methods=()):
     @contextlib.contextmanager
     def fake_urlopen(request):
@@ -150,12 +296,16 @@ def test_command_decorator(
         if "method" in errors:
             raise ValueError("method error")
         if "http" in errors:
-            raise urllib.request.HTTPError("http://nope", 599, "ugh", [], None)
+            raise urllib.request.HTTPError(
+                "http://nope", 599, "ugh", [], io.BytesIO(b"{}")
+            )
         if "http_auth" in errors:
-            raise urllib.request.HTTPError("http://nope", 403, "no", [], None)
+            raise urllib.request.HTTPError(
+                "http://nope", 403, "no", [], io.BytesIO(b"{}")
+            )
         return True
 
-    def fake_load(fp):
+    def fake_loads(raw):
         if "json" in errors:
             raise ValueError("json error")
         if "http_auth" in errors:
@@ -164,7 +314,7 @@ def test_command_decorator(
 
     caplog.set_level(log_level)
     monkeypatch.setattr(fuzzbucket_client.__main__, "log_level", lambda: log_level)
-    monkeypatch.setattr(json, "load", fake_load)
+    monkeypatch.setattr(json, "loads", fake_loads)
     decorated = fuzzbucket_client.__main__._command(fake_method)
     assert decorated(FakeClient(), "known", "unknown") == expected
     for log_match in log_matches:
@@ -174,8 +324,24 @@ def test_command_decorator(
         assert re.search(out_match, captured.out, re.MULTILINE) is not None
 
 
-def test_client_version(capsys):
-    ret = fuzzbucket_client.__main__.main(["fuzzbucket-client", "--version"])
+@pytest.mark.parametrize(
+    ("args", "short_circuit"),
+    [
+        pytest.param(("--version",), True, id="version"),
+        pytest.param(("-j", "--version"), True, id="after_flag"),
+        pytest.param(("--vers",), False, id="abbreviated"),
+    ],
+)
+def test_client_version(monkeypatch, capsys, args, short_circuit):
+    if short_circuit:
+
+        def fake_default_client():
+            raise AssertionError("client built for --version")
+
+        monkeypatch.setattr(
+            fuzzbucket_client.__main__, "default_client", fake_default_client
+        )
+    ret = fuzzbucket_client.__main__.main(["fuzzbucket-client"] + list(args))
     assert ret == 0
     captured = capsys.readouterr()
     assert re.match("fuzzbucket-client .+", captured.out) is not None
@@ -278,8 +444,8 @@ def test_client_login(
 
     client = fuzzbucket_client.__main__.Client()
     monkeypatch.setattr(fuzzbucket_client.__main__, "default_client", lambda: client)
-    monkeypatch.setattr(fuzzbucket_client.__main__.webbrowser, "open", lambda u: None)
-    monkeypatch.setattr(fuzzbucket_client.__main__.getpass, "getpass", fake_getpass)
+    monkeypatch.setattr(webbrowser, "open", lambda u: None)
+    monkeypatch.setattr(getpass, "getpass", fake_getpass)
     monkeypatch.setattr(client, "_write_credentials", fake_write_credentials)
     client._env["FUZZBUCKET_URL"] = url
 
@@ -450,6 +616,50 @@ def test_client_delete(
         assert re.search(log_match, caplog.text, re.MULTILINE)
 
 
+@pytest.mark.parametrize(
+    ("failing_id", "expected"),
+    [
+        pytest.param(None, 0, id="happy"),
+        pytest.param("i-fafafafafa2", 86, id="one_failed"),
+    ],
+)
+def test_client_delete_many(monkeypatch, capsys, caplog, failing_id, expected):
+    client = fuzzbucket_client.__main__.Client()
+    monkeypatch.setattr(fuzzbucket_client.__main__, "default_client", lambda: client)
+    boxes = [
+        {"name": f"welp{i}", "public_ip": None, "instance_id": f"i-fafafafafa{i}"}
+        for i in range(12)
+    ]
+    state = {"sent": [], "deleted": []}
+
+    @contextlib.contextmanager
+    def fake_urlopen(request):
+        if request.get_method() != "DELETE":
+            yield io.StringIO(json.dumps({"boxes": boxes}))
+            return
+        instance_id = request.full_url.split("/")[-1]
+        state["sent"].append(instance_id)
+        if instance_id == failing_id:
+            raise urllib.request.HTTPError(request.full_url, 500, "nope", [], None)
+        state["deleted"].append(instance_id)
+        yield io.StringIO("")
+
+    monkeypatch.setattr(client, "_urlopen", fake_urlopen)
+    ret = fuzzbucket_client.__main__.main(["fuzzbucket-client", "delete", "welp*"])
+    assert ret == expected
+    captured = capsys.readouterr()
+    assert sorted(state["sent"]) == sorted(b["instance_id"] for b in boxes)
+    assert sorted(state["deleted"]) == sorted(
+        b["instance_id"] for b in boxes if b["instance_id"] != failing_id
+    )
+    printed = re.findall(r"^\[(.+)\]$", captured.out, re.MULTILINE)
+    assert sorted(printed) == sorted(
+        b["name"] for b in boxes if b["instance_id"] in state["deleted"]
+    )
+    if failing_id is not None:
+        assert re.search(r"failed to delete boxes .+'welp2'", caplog.text)
+
+
 @pytest.mark.parametrize(
     ("api_response", "http_exc", "cmd_args", "log_matches", "expected"),
     [
@@ -511,6 +721,54 @@ def test_client_reboot(
         assert re.search(log_match, caplog.text, re.MULTILINE)
 
 
+@pytest.mark.parametrize(
+    ("box_search", "expected"),
+    [
+        pytest.param("welp*", ["welp", "welpington"], id="name_glob"),
+        pytest.param("welp", ["welp"], id="name_exact"),
+        pytest.param("rhel8", ["welpington"], id="image_alias"),
+        pytest.param("only?lias", ["onlyalias"], id="alias_without_name"),
+        pytest.param("WELP*", None, id="case_sensitive"),
+    ],
+)
+def test_client__find_boxes(monkeypatch, box_search, expected):
+    client = fuzzbucket_client.__main__.Client()
+    monkeypatch.setattr(
+        client,
+        "_list_boxes",
+        lambda: [
+            {"name": "welp", "image_alias": "ubuntu18"},
+            {"name": "welpington", "image_alias": "rhel8"},
+            {"name": None, "image_alias": "onlyalias"},
+        ],
+    )
+    results = client._find_boxes(box_search)
+    if expected is None:
+        assert results is None
+        return
+    assert [box["name"] or box["image_alias"] for box in results] == expected
+
+
+def test_client__list_boxes_cached(monkeypatch):
+    client = fuzzbucket_client.__main__.Client()
+    state = {"count": 0}
+
+    @contextlib.contextmanager
+    def fake_urlopen(request):
+        state["count"] += 1
+        yield io.StringIO(json.dumps({"boxes": [{"name": "hoarder"}]}))
+
+    monkeypatch.setattr(client, "_urlopen", fake_urlopen)
+    client._setup()
+    assert client._list_boxes() == [{"name": "hoarder"}]
+    assert client._find_box("hoard*") == {"name": "hoarder"}
+    assert state["count"] == 1
+
+    client._cached_boxes = None
+    assert client._list_boxes() == [{"name": "hoarder"}]
+    assert state["count"] == 2
+
+
 def test_client_ssh(monkeypatch):
     client = fuzzbucket_client.__main__.Client()
     monkeypatch.setattr(fuzzbucket_client.__main__, "default_client", lambda: client)
@@ -578,6 +836,68 @@ def test_client_scp(monkeypatch):
     assert ret == 0
 
 
+@pytest.mark.parametrize(
+    ("image_alias", "expected"),
+    [
+        pytest.param("ubuntu18", "ubuntu", id="ubuntu"),
+        pytest.param("CentOS7", "centos", id="centos_mixed_case"),
+        pytest.param("rhel8", "ec2-user", id="rhel"),
+        pytest.param("sles15", "ec2-user", id="sles"),
+        pytest.param("debian10", "ec2-user", id="default"),
+    ],
+)
+def test_client__guess_ssh_user(image_alias, expected):
+    client = fuzzbucket_client.__main__.Client
+    assert client._guess_ssh_user(image_alias, client.default_ssh_user) == expected
+
+
+@pytest.mark.parametrize(
+    ("unknown_args", "expected"),
+    [
+        pytest.param(
+            ["ls"],
+            [
+                "-o",
+                "UserKnownHostsFile=/dev/null",
+                "-o",
+                "StrictHostKeyChecking=no",
+                "ls",
+            ],
+            id="defaults",
+        ),
+        pytest.param(
+            ["-l", "me", "-o", "stricthostkeychecking=yes"],
+            [
+                "-o",
+                "UserKnownHostsFile=/dev/null",
+                "-l",
+                "me",
+                "-o",
+                "stricthostkeychecking=yes",
+            ],
+            id="custom_strict",
+        ),
+        pytest.param(
+            ["-l", "me", "-o", "UserKnownHostsFile=~/.ssh/fb", "-o", "Strict"],
+            [
+                "-o",
+                "StrictHostKeyChecking=no",
+                "-l",
+                "me",
+                "-o",
+                "UserKnownHostsFile=~/.ssh/fb",
+                "-o",
+                "Strict",
+            ],
+            id="custom_known_hosts",
+        ),
+    ],
+)
+def test_client__with_ssh_opts(unknown_args, expected):
+    client = fuzzbucket_client.__main__.Client()
+    assert client._with_ssh_opts(unknown_args) == expected
+
+
 @pytest.mark.parametrize(
     ("api_response", "data_format", "stdout_match", "expected"),
     [
@@ -730,6 +1050,38 @@ def test_client_delete_key(monkeypatch, caplog):
     assert "deleted key" in caplog.text
 
 
+def test_client__format_boxes_ini():
+    client = fuzzbucket_client.__main__.Client()
+    boxes = [
+        {"name": "welp", "public_ip": None, "instance_id": "i-fafafafafaf"},
+        {"name": "welpington", "public_ip": "256.256.0.-1", "ttl": None},
+    ]
+    formatted = client._format_boxes_ini(boxes)
+    assert boxes[0]["public_ip"] is None
+    parsed = configparser.ConfigParser()
+    parsed.read_string(formatted)
+    assert parsed.sections() == ["welp", "welpington"]
+    assert dict(parsed["welp"]) == {
+        "name": "welp",
+        "public_ip": "(pending)",
+        "instance_id": "i-fafafafafaf",
+    }
+    assert dict(parsed["welpington"]) == {
+        "name": "welpington",
+        "public_ip": "256.256.0.-1",
+    }
+
+
+def test_client__format_image_aliases_ini():
+    client = fuzzbucket_client.__main__.Client()
+    formatted = client._format_image_aliases_ini(
+        {"wee": "ami-0a0a0a0a0a", "chonk": "ami-fafababacaca"}
+    )
+    assert formatted == (
+        "[image_aliases]\nchonk = ami-fafababacaca\nwee = ami-0a0a0a0a0a\n\n"
+    )
+
+
 @pytest.mark.parametrize(
     ("user", "secret", "file_exists", "file_content", "write_matches"),
     [
@@ -781,6 +1133,7 @@ def test_client__write_credentials(
 
     client._write_credentials(user, secret)
     assert client._cached_credentials is None
+    assert client._cached_auth_headers is None
     state["out"].seek(0)
     written = state["out"].read()
     assert "# WARNING:" in written